@@ -5,15 +5,37 @@ A cost optimization tool for cleaning up unused AWS resources.
 """
 
 import boto3
+import concurrent.futures
+import functools
+import hashlib
+import io
+import itertools
+import jmespath
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 import click
 import json
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
-from colorama import init, Fore, Style
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Iterable, Iterator, Optional, TextIO, Tuple
 import logging
 
-# Initialize colorama for cross-platform colored output
-init()
+if sys.stdout.isatty():
+    # Initialize colorama for cross-platform colored output
+    from colorama import init, Fore, Style
+    init()
+else:
+    class _NoColor:
+        """Stands in for colorama's Fore/Style when output is not a terminal."""
+        
+        def __getattr__(self, name: str) -> str:
+            return ''
+    
+    Fore = Style = _NoColor()
 
 # Configure logging
 logging.basicConfig(
@@ -22,176 +44,505 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Upper bound on regions scanned/cleaned concurrently
+MAX_REGION_WORKERS = 32
+# Concurrent DeleteSnapshot/ReleaseAddress calls per region
+MAX_DELETE_WORKERS = 16
+# Largest MaxResults DescribeSnapshots/DescribeInstances accept, i.e. fewest round trips
+DESCRIBE_PAGE_SIZE = 1000
+# TerminateInstances accepts up to 1000 instance IDs per call
+TERMINATE_BATCH_SIZE = 1000
+# Report lines written to stdout per write() call
+OUTPUT_BATCH_SIZE = 1000
+
+# Stop time embedded in StateTransitionReason, e.g. "User initiated (2024-03-18 14:22:11 GMT)"
+_STOP_RE = re.compile(r'\((\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) GMT\)')
+
+# Unattached EIPs, projected down to the fields the cleaner needs
+_EIP_EXPR = jmespath.compile(
+    "Addresses[?!InstanceId && !NetworkInterfaceId]"
+    ".{AllocationId: AllocationId, PublicIp: PublicIp, Domain: Domain || 'classic'}"
+)
+
+
+# describe_regions results, cached in-process and on disk. Enabled regions differ
+# per account, so entries are keyed by partition and credentials (see _regions_cache_key).
+REGIONS_CACHE_FILE = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+    'aws-idle-cleaner', 'regions.json'
+)
+REGIONS_CACHE_TTL = 24 * 60 * 60
+_regions_cache: Dict[str, List[str]] = {}
+
+
+def _load_regions_cache() -> Dict[str, Dict[str, Any]]:
+    """Return the cache file's unexpired entries, skipping any that are malformed.
+    
+    Each entry is {'regions': [...], 'fetched': <epoch seconds>}; the TTL is
+    checked per entry since writing one key must not refresh the others.
+    """
+    try:
+        with open(REGIONS_CACHE_FILE) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cached, dict):
+        return {}
+    now = time.time()
+    return {
+        key: entry for key, entry in cached.items()
+        if isinstance(entry, dict) and isinstance(entry.get('regions'), list)
+        and isinstance(entry.get('fetched'), (int, float))
+        and now - entry['fetched'] <= REGIONS_CACHE_TTL
+    }
+
+
+def _read_regions_cache(key: str) -> Optional[List[str]]:
+    """Return cached regions for a cache key if its entry is fresh."""
+    entry = _load_regions_cache().get(key)
+    return entry['regions'] if entry else None
+
+
+def _write_regions_cache(key: str, regions: List[str]) -> None:
+    """Persist regions for a cache key, keeping other keys' unexpired entries."""
+    cached = _load_regions_cache()
+    cached[key] = {'regions': regions, 'fetched': time.time()}
+    try:
+        os.makedirs(os.path.dirname(REGIONS_CACHE_FILE), exist_ok=True)
+        with open(REGIONS_CACHE_FILE, 'w') as f:
+            json.dump(cached, f)
+    except OSError as e:
+        logger.debug(f"Could not write regions cache: {e}")
+
+
+# Mutating EC2 calls share one account-wide budget across all regions/threads
+MUTATING_CALLS_PER_SECOND = 5.0
+_MUTATING_OPERATIONS = ('ReleaseAddress', 'DeleteSnapshot', 'TerminateInstances')
+
+# Error codes meaning the account cannot use this resource type in a region;
+# anything else (throttling included, once retries are spent) propagates
+_SKIP_REGION_CODES = frozenset({'UnauthorizedOperation', 'AccessDenied', 'OptInRequired'})
+
+
+class _TokenBucket:
+    """Thread-safe token bucket allowing `rate` calls per second."""
+    
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, **kwargs) -> None:
+        """Block until a token is available. Usable as a botocore event handler."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+_MUTATING_LIMITER = _TokenBucket(MUTATING_CALLS_PER_SECOND)
+
+
+# One session for the whole process; clients are cached per region so
+# repeated cleaners (e.g. one per region) skip endpoint/model loading
+_SESSION = boto3.Session()
+_CLIENT_CONFIG = Config(
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    max_pool_connections=50
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _ec2_client(region: str):
+    """Return the shared EC2 client for a region."""
+    client = _SESSION.client('ec2', region_name=region, config=_CLIENT_CONFIG)
+    for operation in _MUTATING_OPERATIONS:
+        client.meta.events.register(f'before-call.ec2.{operation}', _MUTATING_LIMITER.acquire)
+    return client
+
+
+def _color(text: str, color: str) -> str:
+    """Wrap text in an ANSI color; a no-op off-terminal, where Fore/Style are _NoColor."""
+    return f"{color}{text}{Style.RESET_ALL}"
+
+
+class _OutputBuffer:
+    """Collects report lines and writes them to a stream (stdout by default) in chunks."""
+    
+    def __init__(self, stream: Optional[TextIO] = None, batch_size: int = OUTPUT_BATCH_SIZE):
+        self.stream = stream
+        self.batch_size = batch_size
+        self._lines: List[str] = []
+    
+    def add(self, line: str) -> None:
+        self._lines.append(line)
+        if len(self._lines) >= self.batch_size:
+            self.flush()
+    
+    def flush(self) -> None:
+        if self._lines:
+            (self.stream or sys.stdout).write("\n".join(self._lines) + "\n")
+            self._lines = []
+    
+    def __enter__(self) -> '_OutputBuffer':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+
+def _batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield successive lists of at most `size` items."""
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
 
 class AWSResourceCleaner:
     """Main class for AWS resource cleanup operations."""
     
-    def __init__(self, region: str = 'us-east-1', dry_run: bool = True):
+    def __init__(self, region: str = 'us-east-1', dry_run: bool = True,
+                 output: Optional[TextIO] = None):
         self.region = region
         self.dry_run = dry_run
-        self.ec2_client = boto3.client('ec2', region_name=region)
-        self.session = boto3.Session()
+        self.output = output
+        self.ec2_client = _ec2_client(region)
+        self.session = _SESSION
+        # Resource types the account may not list here, mapped to the error code
+        self.skipped: Dict[str, str] = {}
+        # Resource types whose cleanup failed part-way, mapped to the error code
+        self.failed: Dict[str, str] = {}
         
     def get_all_regions(self) -> List[str]:
-        """Get list of all available AWS regions."""
+        """Get list of all available AWS regions, cached for REGIONS_CACHE_TTL."""
+        key = self._regions_cache_key()
+        regions = _regions_cache.get(key) or _read_regions_cache(key)
+        if regions:
+            _regions_cache[key] = regions
+            return regions
+        
         try:
-            regions = self.ec2_client.describe_regions()
-            return [region['RegionName'] for region in regions['Regions']]
-        except Exception as e:
+            response = self.ec2_client.describe_regions()
+            regions = [region['RegionName'] for region in response['Regions']]
+        except ClientError as e:
+            if e.response['Error']['Code'] not in _SKIP_REGION_CODES:
+                raise
             logger.error(f"Error getting regions: {e}")
             return [self.region]
+        
+        _regions_cache[key] = regions
+        _write_regions_cache(key, regions)
+        return regions
     
-    def find_unused_elastic_ips(self) -> List[Dict[str, Any]]:
+    def _regions_cache_key(self) -> str:
+        """Identify the partition and credentials a region list belongs to.
+        
+        The access key ID is hashed so it is never written to the cache file.
+        """
+        partition = getattr(self.ec2_client.meta, 'partition', 'aws')
+        credentials = self.session.get_credentials()
+        access_key = credentials.access_key if credentials else ''
+        return f"{partition}:{hashlib.sha256(access_key.encode()).hexdigest()[:16]}"
+    
+    def find_unused_elastic_ips(self) -> Iterator[Dict[str, Any]]:
         """Find unattached Elastic IP addresses."""
         try:
             response = self.ec2_client.describe_addresses()
-            unused_eips = []
-            
-            for eip in response['Addresses']:
-                if 'InstanceId' not in eip and 'NetworkInterfaceId' not in eip:
-                    unused_eips.append({
-                        'AllocationId': eip.get('AllocationId'),
-                        'PublicIp': eip.get('PublicIp'),
-                        'Domain': eip.get('Domain', 'classic')
-                    })
-            
-            return unused_eips
-        except Exception as e:
-            logger.error(f"Error finding unused EIPs: {e}")
-            return []
+            yield from _EIP_EXPR.search(response)
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code not in _SKIP_REGION_CODES:
+                raise
+            logger.warning(f"Skipping unused EIPs in {self.region}: {code}")
+            self.skipped['eips'] = code
     
-    def find_old_snapshots(self, days: int = 30) -> List[Dict[str, Any]]:
-        """Find EBS snapshots older than specified days."""
+    def find_old_snapshots(self, days: int = 30) -> Iterator[Dict[str, Any]]:
+        """Find EBS snapshots older than specified days, filtering page by page."""
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            response = self.ec2_client.describe_snapshots(OwnerIds=['self'])
-            old_snapshots = []
-            
-            for snapshot in response['Snapshots']:
-                start_time = snapshot['StartTime'].replace(tzinfo=None)
-                if start_time < cutoff_date:
-                    old_snapshots.append({
-                        'SnapshotId': snapshot['SnapshotId'],
-                        'Description': snapshot.get('Description', 'No description'),
-                        'StartTime': snapshot['StartTime'],
-                        'VolumeSize': snapshot['VolumeSize']
-                    })
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+            paginator = self.ec2_client.get_paginator('describe_snapshots')
+            pages = paginator.paginate(
+                OwnerIds=['self'],
+                PaginationConfig={'PageSize': DESCRIBE_PAGE_SIZE}
+            )
             
-            return old_snapshots
-        except Exception as e:
-            logger.error(f"Error finding old snapshots: {e}")
-            return []
+            for page in pages:
+                for snapshot in page['Snapshots']:
+                    if snapshot['StartTime'] < cutoff_date:
+                        yield {
+                            'SnapshotId': snapshot['SnapshotId'],
+                            'Description': snapshot.get('Description', 'No description'),
+                            'StartTime': snapshot['StartTime'],
+                            'VolumeSize': snapshot['VolumeSize']
+                        }
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code not in _SKIP_REGION_CODES:
+                raise
+            logger.warning(f"Skipping old snapshots in {self.region}: {code}")
+            self.skipped['snapshots'] = code
     
-    def find_stopped_instances(self, days: int = 7) -> List[Dict[str, Any]]:
-        """Find EC2 instances that have been stopped for more than specified days."""
+    def find_stopped_instances(self, days: int = 7) -> Iterator[Dict[str, Any]]:
+        """Find EC2 instances that have been stopped for more than specified days.
+        
+        The stop time is parsed from StateTransitionReason; instances whose
+        reason carries no timestamp are skipped.
+        """
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            response = self.ec2_client.describe_instances(
-                Filters=[{'Name': 'instance-state-name', 'Values': ['stopped']}]
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+            paginator = self.ec2_client.get_paginator('describe_instances')
+            pages = paginator.paginate(
+                Filters=[{'Name': 'instance-state-name', 'Values': ['stopped']}],
+                PaginationConfig={'PageSize': DESCRIBE_PAGE_SIZE}
             )
             
-            old_stopped_instances = []
-            for reservation in response['Reservations']:
-                for instance in reservation['Instances']:
-                    # Check state transition time
-                    for transition in instance.get('StateTransitionReason', ''):
-                        if 'stopped' in transition.lower():
-                            # Parse the transition time if available
-                            state_reason = instance.get('StateReason', {})
-                            # For simplicity, we'll use launch time as approximation
-                            launch_time = instance['LaunchTime'].replace(tzinfo=None)
-                            if launch_time < cutoff_date:
-                                old_stopped_instances.append({
-                                    'InstanceId': instance['InstanceId'],
-                                    'InstanceType': instance['InstanceType'],
-                                    'LaunchTime': instance['LaunchTime'],
-                                    'State': instance['State']['Name'],
-                                    'Name': self._get_instance_name(instance)
-                                })
-            
-            return old_stopped_instances
-        except Exception as e:
-            logger.error(f"Error finding stopped instances: {e}")
-            return []
+            for page in pages:
+                for reservation in page['Reservations']:
+                    for instance in reservation['Instances']:
+                        match = _STOP_RE.search(instance.get('StateTransitionReason', ''))
+                        if not match:
+                            continue
+                        stopped_at = datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S')
+                        if stopped_at.replace(tzinfo=timezone.utc) < cutoff_date:
+                            yield {
+                                'InstanceId': instance['InstanceId'],
+                                'InstanceType': instance['InstanceType'],
+                                'LaunchTime': instance['LaunchTime'],
+                                'State': instance['State']['Name'],
+                                'Name': self._get_instance_name(instance)
+                            }
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code not in _SKIP_REGION_CODES:
+                raise
+            logger.warning(f"Skipping stopped instances in {self.region}: {code}")
+            self.skipped['instances'] = code
     
     def _get_instance_name(self, instance: Dict) -> str:
         """Extract instance name from tags."""
-        tags = instance.get('Tags', [])
-        for tag in tags:
-            if tag['Key'] == 'Name':
-                return tag['Value']
-        return 'No Name'
+        return next((tag['Value'] for tag in instance.get('Tags', ()) if tag['Key'] == 'Name'), 'No Name')
     
-    def clean_elastic_ips(self, eips: List[Dict[str, Any]]) -> int:
+    def _release_eip(self, eip: Dict[str, Any]) -> Tuple[bool, str]:
+        """Release a single Elastic IP, returning the outcome and a report line."""
+        try:
+            if eip['Domain'] == 'vpc':
+                self.ec2_client.release_address(AllocationId=eip['AllocationId'])
+            else:
+                self.ec2_client.release_address(PublicIp=eip['PublicIp'])
+            
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Released EIP: {eip['PublicIp']}")
+            return True, _color(f"Released EIP: {eip['PublicIp']}", Fore.GREEN)
+        except (ClientError, BotoCoreError) as e:
+            logger.error(f"Error releasing EIP {eip['PublicIp']}: {e}")
+            return False, _color(f"Error releasing EIP {eip['PublicIp']}: {e}", Fore.RED)
+    
+    def clean_elastic_ips(self, eips: Iterable[Dict[str, Any]]) -> int:
         """Release unused Elastic IP addresses."""
         cleaned_count = 0
-        
-        for eip in eips:
-            try:
-                if self.dry_run:
-                    print(f"{Fore.YELLOW}[DRY RUN] Would release EIP: {eip['PublicIp']}{Style.RESET_ALL}")
-                else:
-                    if eip['Domain'] == 'vpc':
-                        self.ec2_client.release_address(AllocationId=eip['AllocationId'])
-                    else:
-                        self.ec2_client.release_address(PublicIp=eip['PublicIp'])
-                    
-                    print(f"{Fore.GREEN}Released EIP: {eip['PublicIp']}{Style.RESET_ALL}")
-                    logger.info(f"Released EIP: {eip['PublicIp']}")
-                
-                cleaned_count += 1
-            except Exception as e:
-                print(f"{Fore.RED}Error releasing EIP {eip['PublicIp']}: {e}{Style.RESET_ALL}")
-                logger.error(f"Error releasing EIP {eip['PublicIp']}: {e}")
-        
+        with _OutputBuffer(self.output) as out:
+            if self.dry_run:
+                line_format = _color("[DRY RUN] Would release EIP: %s", Fore.YELLOW)
+                for eip in eips:
+                    out.add(line_format % eip['PublicIp'])
+                    cleaned_count += 1
+                return cleaned_count
+            
+            # ReleaseAddress has no batch form, so issue the calls concurrently
+            with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_DELETE_WORKERS) as executor:
+                for released, line in executor.map(self._release_eip, eips):
+                    out.add(line)
+                    cleaned_count += released
         return cleaned_count
     
-    def clean_snapshots(self, snapshots: List[Dict[str, Any]]) -> int:
+    def _delete_snapshot(self, snapshot: Dict[str, Any]) -> Tuple[bool, str]:
+        """Delete a single snapshot, returning the outcome and a report line."""
+        try:
+            self.ec2_client.delete_snapshot(SnapshotId=snapshot['SnapshotId'])
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Deleted snapshot: {snapshot['SnapshotId']}")
+            return True, _color(f"Deleted snapshot: {snapshot['SnapshotId']} "
+                                f"({snapshot['VolumeSize']}GB)", Fore.GREEN)
+        except (ClientError, BotoCoreError) as e:
+            logger.error(f"Error deleting snapshot {snapshot['SnapshotId']}: {e}")
+            return False, _color(f"Error deleting snapshot {snapshot['SnapshotId']}: {e}", Fore.RED)
+    
+    def clean_snapshots(self, snapshots: Iterable[Dict[str, Any]]) -> int:
         """Delete old EBS snapshots."""
         cleaned_count = 0
+        with _OutputBuffer(self.output) as out:
+            if self.dry_run:
+                line_format = _color("[DRY RUN] Would delete snapshot: %s (%sGB)", Fore.YELLOW)
+                for snapshot in snapshots:
+                    out.add(line_format % (snapshot['SnapshotId'], snapshot['VolumeSize']))
+                    cleaned_count += 1
+                return cleaned_count
+            
+            # DeleteSnapshot has no batch form, so issue the calls concurrently
+            with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_DELETE_WORKERS) as executor:
+                for deleted, line in executor.map(self._delete_snapshot, snapshots):
+                    out.add(line)
+                    cleaned_count += deleted
+        return cleaned_count
+    
+    def confirm_termination(self, instance: Dict[str, Any]) -> bool:
+        """Ask for extra confirmation before terminating an instance."""
+        if click.confirm(f"Are you sure you want to terminate {instance['InstanceId']} ({instance['Name']})?"):
+            return True
+        print(_color(f"Skipped instance: {instance['InstanceId']}", Fore.BLUE))
+        return False
+    
+    def clean_stopped_instances(self, instances: Iterable[Dict[str, Any]], confirm: bool = True) -> int:
+        """Terminate long-stopped EC2 instances in batches of TERMINATE_BATCH_SIZE.
+        
+        Pass confirm=False when the instances were already confirmed via
+        confirm_termination, e.g. before handing them to a worker thread.
+        """
+        if self.dry_run:
+            cleaned_count = 0
+            line_format = _color("[DRY RUN] Would terminate instance: %s (%s)", Fore.YELLOW)
+            with _OutputBuffer(self.output) as out:
+                for instance in instances:
+                    out.add(line_format % (instance['InstanceId'], instance['Name']))
+                    cleaned_count += 1
+            return cleaned_count
         
-        for snapshot in snapshots:
-            try:
-                if self.dry_run:
-                    print(f"{Fore.YELLOW}[DRY RUN] Would delete snapshot: {snapshot['SnapshotId']} "
-                          f"({snapshot['VolumeSize']}GB){Style.RESET_ALL}")
-                else:
-                    self.ec2_client.delete_snapshot(SnapshotId=snapshot['SnapshotId'])
-                    print(f"{Fore.GREEN}Deleted snapshot: {snapshot['SnapshotId']} "
-                          f"({snapshot['VolumeSize']}GB){Style.RESET_ALL}")
-                    logger.info(f"Deleted snapshot: {snapshot['SnapshotId']}")
-                
-                cleaned_count += 1
-            except Exception as e:
-                print(f"{Fore.RED}Error deleting snapshot {snapshot['SnapshotId']}: {e}{Style.RESET_ALL}")
-                logger.error(f"Error deleting snapshot {snapshot['SnapshotId']}: {e}")
+        if confirm:
+            instances = [instance for instance in instances if self.confirm_termination(instance)]
+        
+        cleaned_count = 0
+        with _OutputBuffer(self.output) as out:
+            for batch in _batched(instances, TERMINATE_BATCH_SIZE):
+                terminated, lines = self._terminate_batch(batch)
+                cleaned_count += terminated
+                for line in lines:
+                    out.add(line)
         
         return cleaned_count
     
-    def clean_stopped_instances(self, instances: List[Dict[str, Any]]) -> int:
-        """Terminate long-stopped EC2 instances."""
-        cleaned_count = 0
+    def _terminate_batch(self, batch: List[Dict[str, Any]]) -> Tuple[int, List[str]]:
+        """Terminate a batch of instances, returning how many terminated and report lines.
         
-        for instance in instances:
-            try:
-                if self.dry_run:
-                    print(f"{Fore.YELLOW}[DRY RUN] Would terminate instance: {instance['InstanceId']} "
-                          f"({instance['Name']}){Style.RESET_ALL}")
-                else:
-                    # Add extra confirmation for instance termination
-                    if click.confirm(f"Are you sure you want to terminate {instance['InstanceId']} ({instance['Name']})?"):
-                        self.ec2_client.terminate_instances(InstanceIds=[instance['InstanceId']])
-                        print(f"{Fore.GREEN}Terminated instance: {instance['InstanceId']} "
-                              f"({instance['Name']}){Style.RESET_ALL}")
-                        logger.info(f"Terminated instance: {instance['InstanceId']}")
-                        cleaned_count += 1
-                    else:
-                        print(f"{Fore.BLUE}Skipped instance: {instance['InstanceId']}{Style.RESET_ALL}")
-            except Exception as e:
-                print(f"{Fore.RED}Error terminating instance {instance['InstanceId']}: {e}{Style.RESET_ALL}")
-                logger.error(f"Error terminating instance {instance['InstanceId']}: {e}")
+        One bad ID (already gone, termination-protected, ...) fails the whole
+        TerminateInstances call even though part of the batch may have been
+        terminated, so a failed batch is retried one instance at a time.
+        """
+        instance_ids = [instance['InstanceId'] for instance in batch]
+        try:
+            response = self.ec2_client.terminate_instances(InstanceIds=instance_ids)
+        except (ClientError, BotoCoreError) as e:
+            if len(batch) > 1:
+                logger.warning(f"Terminating {len(batch)} instances failed, retrying one at a time: {e}")
+                outcomes = [self._terminate_batch([instance]) for instance in batch]
+                return sum(count for count, _ in outcomes), [line for _, lines in outcomes for line in lines]
+            logger.error(f"Error terminating instance {instance_ids[0]}: {e}")
+            return 0, [_color(f"Error terminating instance {instance_ids[0]}: {e}", Fore.RED)]
         
-        return cleaned_count
+        terminating = {item['InstanceId'] for item in response.get('TerminatingInstances', ())}
+        line_format = _color("Terminated instance: %s (%s)", Fore.GREEN)
+        log_info = logger.isEnabledFor(logging.INFO)
+        lines = []
+        for instance in batch:
+            if instance['InstanceId'] in terminating:
+                lines.append(line_format % (instance['InstanceId'], instance['Name']))
+                if log_info:
+                    logger.info(f"Terminated instance: {instance['InstanceId']}")
+        return len(terminating), lines
+
+
+# Per resource type: heading shown before listing, noun for counts, label for the confirm prompt
+_RESOURCE_REPORTS = {
+    'eips': ("Finding unused Elastic IPs...", "unused Elastic IPs", "EIP"),
+    'snapshots': ("Finding old snapshots (>{days} days)...", "old snapshots", "snapshot"),
+    'instances': ("Finding stopped instances (>{days} days)...", "long-stopped instances", "instance"),
+}
+
+
+def _find_candidates(cleaner: AWSResourceCleaner, resource_type: str, days: int) -> Iterator[Dict[str, Any]]:
+    """List cleanup candidates of one resource type."""
+    if resource_type == 'eips':
+        return cleaner.find_unused_elastic_ips()
+    if resource_type == 'snapshots':
+        return cleaner.find_old_snapshots(days)
+    return cleaner.find_stopped_instances(days)
+
+
+def _clean_candidates(cleaner: AWSResourceCleaner, resource_type: str,
+                      candidates: Iterable[Dict[str, Any]]) -> int:
+    """Clean (or, in dry-run mode, report) candidates of one resource type."""
+    if resource_type == 'eips':
+        return cleaner.clean_elastic_ips(candidates)
+    if resource_type == 'snapshots':
+        return cleaner.clean_snapshots(candidates)
+    return cleaner.clean_stopped_instances(candidates, confirm=False)
+
+
+def _report_heading(out: TextIO, resource_type: str, days: int) -> None:
+    """Write the heading shown before a resource type is listed."""
+    heading = _RESOURCE_REPORTS[resource_type][0].format(days=days)
+    out.write("\n" + _color(heading, Fore.MAGENTA) + "\n")
+
+
+def _report_count(out: TextIO, cleaner: AWSResourceCleaner, resource_type: str, count: int) -> None:
+    """Write the outcome of listing a resource type: skipped, found N, or none found."""
+    noun = _RESOURCE_REPORTS[resource_type][1]
+    if resource_type in cleaner.skipped:
+        out.write(_color(f"Skipped: {cleaner.skipped[resource_type]}", Fore.RED) + "\n")
+    elif count:
+        out.write(f"Found {count} {noun}\n")
+    else:
+        out.write(f"No {noun} found\n")
+
+
+def _preview_region(cleaner: AWSResourceCleaner, resource_types: List[str], days: int) -> Dict[str, int]:
+    """Write a dry-run report for a single region to cleaner.output. Runs in a worker thread.
+    
+    Candidates stream straight from the paginators into the report, so no
+    list of resources is built; counts are reported after each listing.
+    """
+    counts = {'eips': 0, 'snapshots': 0, 'instances': 0}
+    for resource_type in resource_types:
+        _report_heading(cleaner.output, resource_type, days)
+        candidates = _find_candidates(cleaner, resource_type, days)
+        counts[resource_type] = _clean_candidates(cleaner, resource_type, candidates)
+        _report_count(cleaner.output, cleaner, resource_type, counts[resource_type])
+    return counts
+
+
+def _scan_region(cleaner: AWSResourceCleaner, resource_types: List[str],
+                 days: int) -> Dict[str, List[Dict[str, Any]]]:
+    """Collect cleanup candidates in a single region for confirmation. Runs in a worker thread."""
+    return {
+        resource_type: list(_find_candidates(cleaner, resource_type, days))
+        for resource_type in resource_types
+    }
+
+
+def _clean_region(cleaner: AWSResourceCleaner, plan: Dict[str, List[Dict[str, Any]]]) -> Dict[str, int]:
+    """Apply an already-confirmed cleanup plan for a single region.
+    
+    A resource type that fails is reported in the region's output and in
+    cleaner.failed rather than raised, so what the other types and regions
+    already cleaned is still printed and totalled.
+    """
+    counts = {'eips': 0, 'snapshots': 0, 'instances': 0}
+    for resource_type, candidates in plan.items():
+        try:
+            counts[resource_type] = _clean_candidates(cleaner, resource_type, candidates)
+        except Exception as e:
+            code = e.response['Error']['Code'] if isinstance(e, ClientError) else type(e).__name__
+            logger.error(f"Error cleaning {resource_type} in {cleaner.region}: {e}")
+            cleaner.output.write(_color(f"Error cleaning {resource_type}: {e}", Fore.RED) + "\n")
+            cleaner.failed[resource_type] = code
+    return counts
 
 
 @click.command()
@@ -206,7 +557,7 @@ class AWSResourceCleaner:
 def main(region, all_regions, dry_run, clean_eips, clean_snapshots, clean_instances, days, force):
     """AWS Idle Resource Cleaner - Optimize your AWS costs by cleaning unused resources."""
     
-    print(f"{Fore.CYAN}AWS Idle Resource Cleaner{Style.RESET_ALL}")
+    print(_color("AWS Idle Resource Cleaner", Fore.CYAN))
     print(f"Mode: {'DRY RUN' if dry_run else 'LIVE CLEANUP'}")
     print("-" * 50)
     
@@ -219,62 +570,86 @@ def main(region, all_regions, dry_run, clean_eips, clean_snapshots, clean_instan
         regions_to_scan = [region]
         print(f"Scanning region: {region}")
     
+    selected = (('eips', clean_eips), ('snapshots', clean_snapshots), ('instances', clean_instances))
+    resource_types = [resource_type for resource_type, enabled in selected if enabled]
     total_cleaned = {'eips': 0, 'snapshots': 0, 'instances': 0}
+    max_workers = max(1, min(MAX_REGION_WORKERS, len(regions_to_scan)))
     
-    for current_region in regions_to_scan:
-        print(f"\n{Fore.BLUE}Region: {current_region}{Style.RESET_ALL}")
-        cleaner = AWSResourceCleaner(current_region, dry_run)
-        
-        # Clean Elastic IPs
-        if clean_eips:
-            print(f"\n{Fore.MAGENTA}Finding unused Elastic IPs...{Style.RESET_ALL}")
-            unused_eips = cleaner.find_unused_elastic_ips()
-            if unused_eips:
-                print(f"Found {len(unused_eips)} unused Elastic IPs")
-                if not dry_run and not force:
-                    if not click.confirm("Proceed with EIP cleanup?"):
-                        continue
-                cleaned = cleaner.clean_elastic_ips(unused_eips)
-                total_cleaned['eips'] += cleaned
-            else:
-                print("No unused Elastic IPs found")
+    # Clients are created up front: building them from a shared session is not thread-safe.
+    # Each region reports into its own buffer, printed in region order once it finishes.
+    cleaners = [
+        AWSResourceCleaner(current_region, dry_run, output=io.StringIO())
+        for current_region in regions_to_scan
+    ]
+    
+    if dry_run:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            previews = executor.map(
+                lambda c: _preview_region(c, resource_types, days),
+                cleaners
+            )
+            for cleaner, counts in zip(cleaners, previews):
+                print("\n" + _color(f"Region: {cleaner.region}", Fore.BLUE))
+                sys.stdout.write(cleaner.output.getvalue())
+                cleaner.output.close()
+                for resource_type, cleaned in counts.items():
+                    total_cleaned[resource_type] += cleaned
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            scans = list(executor.map(
+                lambda c: _scan_region(c, resource_types, days),
+                cleaners
+            ))
         
-        # Clean old snapshots
-        if clean_snapshots:
-            print(f"\n{Fore.MAGENTA}Finding old snapshots (>{days} days)...{Style.RESET_ALL}")
-            old_snapshots = cleaner.find_old_snapshots(days)
-            if old_snapshots:
-                print(f"Found {len(old_snapshots)} old snapshots")
-                if not dry_run and not force:
-                    if not click.confirm("Proceed with snapshot cleanup?"):
-                        continue
-                cleaned = cleaner.clean_snapshots(old_snapshots)
-                total_cleaned['snapshots'] += cleaned
-            else:
-                print("No old snapshots found")
+        # Report and confirm on the main thread so prompts never run in a worker
+        plans = []
+        for cleaner, found in zip(cleaners, scans):
+            print("\n" + _color(f"Region: {cleaner.region}", Fore.BLUE))
+            plan = {}
+            plans.append((cleaner, plan))
+            
+            for resource_type, candidates in found.items():
+                _report_heading(sys.stdout, resource_type, days)
+                _report_count(sys.stdout, cleaner, resource_type, len(candidates))
+                if not candidates:
+                    continue
+                # Declining a prompt skips the rest of this region
+                label = _RESOURCE_REPORTS[resource_type][2]
+                if not force and not click.confirm(f"Proceed with {label} cleanup?"):
+                    break
+                if resource_type == 'instances':
+                    candidates = [instance for instance in candidates if cleaner.confirm_termination(instance)]
+                plan[resource_type] = candidates
         
-        # Clean stopped instances
-        if clean_instances:
-            print(f"\n{Fore.MAGENTA}Finding stopped instances (>{days} days)...{Style.RESET_ALL}")
-            stopped_instances = cleaner.find_stopped_instances(days)
-            if stopped_instances:
-                print(f"Found {len(stopped_instances)} long-stopped instances")
-                if not dry_run and not force:
-                    if not click.confirm("Proceed with instance cleanup?"):
-                        continue
-                cleaned = cleaner.clean_stopped_instances(stopped_instances)
-                total_cleaned['instances'] += cleaned
-            else:
-                print("No long-stopped instances found")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            applied = executor.map(lambda item: _clean_region(*item), plans)
+            for (cleaner, plan), counts in zip(plans, applied):
+                report = cleaner.output.getvalue()
+                cleaner.output.close()
+                if report:
+                    print("\n" + _color(f"Results for region: {cleaner.region}", Fore.BLUE))
+                    sys.stdout.write(report)
+                for resource_type, cleaned in counts.items():
+                    total_cleaned[resource_type] += cleaned
     
     # Summary
-    print(f"\n{Fore.GREEN}Cleanup Summary:{Style.RESET_ALL}")
+    print("\n" + _color("Cleanup Summary:", Fore.GREEN))
     print(f"Elastic IPs: {total_cleaned['eips']}")
     print(f"Snapshots: {total_cleaned['snapshots']}")
     print(f"Instances: {total_cleaned['instances']}")
     
+    skipped = [f"{cleaner.region}/{resource_type} ({code})"
+               for cleaner in cleaners for resource_type, code in cleaner.skipped.items()]
+    if skipped:
+        print(_color(f"Skipped (no access): {', '.join(skipped)}", Fore.RED))
+    
+    failed = [f"{cleaner.region}/{resource_type} ({code})"
+              for cleaner in cleaners for resource_type, code in cleaner.failed.items()]
+    if failed:
+        print(_color(f"Failed (results incomplete): {', '.join(failed)}", Fore.RED))
+    
     if dry_run:
-        print(f"\n{Fore.YELLOW}This was a dry run. Use --no-dry-run to apply changes.{Style.RESET_ALL}")
+        print("\n" + _color("This was a dry run. Use --no-dry-run to apply changes.", Fore.YELLOW))
 
 
 if __name__ == '__main__':
@@ -20,7 +20,7 @@ mkdir -p deployment/
 
 # Copy source files
 cp lambda_function.py deployment/
-cp requirements.txt deployment/
+cp requirements-lambda.txt deployment/requirements.txt
 
 # Install dependencies
 echo "Installing dependencies..."
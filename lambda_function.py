@@ -4,181 +4,341 @@ AWS Lambda version of the Idle Resource Cleaner
 
 import json
 import boto3
-from datetime import datetime, timedelta
-from typing import Dict, Any, List
+import concurrent.futures
+import functools
+import itertools
+import jmespath
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterable, Iterator, List, Optional
 import logging
+import re
+import threading
+import time
 
 # Configure logging for Lambda
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Upper bound on regions processed concurrently per invocation
+MAX_REGION_WORKERS = 32
+# Concurrent DeleteSnapshot/ReleaseAddress calls per region
+MAX_DELETE_WORKERS = 16
+# Largest MaxResults DescribeSnapshots/DescribeInstances accept, i.e. fewest round trips
+DESCRIBE_PAGE_SIZE = 1000
+# TerminateInstances accepts up to 1000 instance IDs per call
+TERMINATE_BATCH_SIZE = 1000
+# Resource types handled by cleanup_resources, one worker thread each
+RESOURCE_TYPES = ('eips', 'snapshots', 'instances')
+
+# Stop time embedded in StateTransitionReason, e.g. "User initiated (2024-03-18 14:22:11 GMT)"
+_STOP_RE = re.compile(r'\((\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) GMT\)')
+
+# Compiled once per container; reused across warm invocations
+_EIP_EXPR = jmespath.compile(
+    "Addresses[?!InstanceId && !NetworkInterfaceId]"
+    ".{AllocationId: AllocationId, PublicIp: PublicIp, Domain: Domain || 'classic'}"
+)
+
+# Mutating EC2 calls share one account-wide budget across all regions/threads
+MUTATING_CALLS_PER_SECOND = 5.0
+_MUTATING_OPERATIONS = ('ReleaseAddress', 'DeleteSnapshot', 'TerminateInstances')
+
+# Error codes meaning the account cannot use this resource type in a region;
+# anything else (throttling included, once retries are spent) propagates
+_SKIP_REGION_CODES = frozenset({'UnauthorizedOperation', 'AccessDenied', 'OptInRequired'})
+
+
+class _TokenBucket:
+    """Thread-safe token bucket allowing `rate` calls per second."""
+    
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, **kwargs) -> None:
+        """Block until a token is available. Usable as a botocore event handler."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+_MUTATING_LIMITER = _TokenBucket(MUTATING_CALLS_PER_SECOND)
+
+
+# Created at import time so warm invocations reuse the session and the
+# per-region clients instead of rebuilding them on every event
+_SESSION = boto3.Session()
+_CLIENT_CONFIG = Config(
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    max_pool_connections=50
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _ec2_client(region: str):
+    """Return the shared EC2 client for a region."""
+    client = _SESSION.client('ec2', region_name=region, config=_CLIENT_CONFIG)
+    for operation in _MUTATING_OPERATIONS:
+        client.meta.events.register(f'before-call.ec2.{operation}', _MUTATING_LIMITER.acquire)
+    return client
+
+
+# Build the client for the function's own region (the default target) during
+# the init phase, so endpoint data and the EC2 service model are already
+# loaded when the first event arrives
+if _SESSION.region_name:
+    _ec2_client(_SESSION.region_name)
+
+
+def _error_code(e: Exception) -> str:
+    """Return the AWS error code of a ClientError, or the exception's type name."""
+    return e.response['Error']['Code'] if isinstance(e, ClientError) else type(e).__name__
+
+
+def _batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield successive lists of at most `size` items."""
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
 
 class LambdaResourceCleaner:
     """Lambda-optimized version of AWS Resource Cleaner."""
     
     def __init__(self, region: str = None):
-        self.region = region or boto3.Session().region_name
-        self.ec2_client = boto3.client('ec2', region_name=self.region)
+        self.region = region or _SESSION.region_name
+        self.ec2_client = _ec2_client(self.region)
+        # Resource types the account may not list here, mapped to the error code
+        self.skipped: Dict[str, str] = {}
     
-    def find_unused_elastic_ips(self) -> List[Dict[str, Any]]:
+    def find_unused_elastic_ips(self) -> Iterator[Dict[str, Any]]:
         """Find unattached Elastic IP addresses."""
         try:
             response = self.ec2_client.describe_addresses()
-            unused_eips = []
-            
-            for eip in response['Addresses']:
-                if 'InstanceId' not in eip and 'NetworkInterfaceId' not in eip:
-                    unused_eips.append({
-                        'AllocationId': eip.get('AllocationId'),
-                        'PublicIp': eip.get('PublicIp'),
-                        'Domain': eip.get('Domain', 'classic')
-                    })
-            
-            return unused_eips
-        except Exception as e:
-            logger.error(f"Error finding unused EIPs: {e}")
-            return []
+            yield from _EIP_EXPR.search(response)
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code not in _SKIP_REGION_CODES:
+                raise
+            logger.warning(f"Skipping unused EIPs in {self.region}: {code}")
+            self.skipped['eips'] = code
     
-    def find_old_snapshots(self, days: int = 30) -> List[Dict[str, Any]]:
-        """Find EBS snapshots older than specified days."""
+    def find_old_snapshots(self, days: int = 30) -> Iterator[Dict[str, Any]]:
+        """Find EBS snapshots older than specified days, filtering page by page."""
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            response = self.ec2_client.describe_snapshots(OwnerIds=['self'])
-            old_snapshots = []
-            
-            for snapshot in response['Snapshots']:
-                start_time = snapshot['StartTime'].replace(tzinfo=None)
-                if start_time < cutoff_date:
-                    old_snapshots.append({
-                        'SnapshotId': snapshot['SnapshotId'],
-                        'Description': snapshot.get('Description', 'No description'),
-                        'StartTime': snapshot['StartTime'].isoformat(),
-                        'VolumeSize': snapshot['VolumeSize']
-                    })
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+            paginator = self.ec2_client.get_paginator('describe_snapshots')
+            pages = paginator.paginate(
+                OwnerIds=['self'],
+                PaginationConfig={'PageSize': DESCRIBE_PAGE_SIZE}
+            )
             
-            return old_snapshots
-        except Exception as e:
-            logger.error(f"Error finding old snapshots: {e}")
-            return []
+            for page in pages:
+                for snapshot in page['Snapshots']:
+                    if snapshot['StartTime'] < cutoff_date:
+                        yield {
+                            'SnapshotId': snapshot['SnapshotId'],
+                            'Description': snapshot.get('Description', 'No description'),
+                            'StartTime': snapshot['StartTime'].isoformat(),
+                            'VolumeSize': snapshot['VolumeSize']
+                        }
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code not in _SKIP_REGION_CODES:
+                raise
+            logger.warning(f"Skipping old snapshots in {self.region}: {code}")
+            self.skipped['snapshots'] = code
     
-    def find_stopped_instances(self, days: int = 7) -> List[Dict[str, Any]]:
-        """Find EC2 instances that have been stopped for more than specified days."""
+    def find_stopped_instances(self, days: int = 7) -> Iterator[Dict[str, Any]]:
+        """Find EC2 instances that have been stopped for more than specified days.
+        
+        The stop time is parsed from StateTransitionReason; instances whose
+        reason carries no timestamp are skipped.
+        """
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            response = self.ec2_client.describe_instances(
-                Filters=[{'Name': 'instance-state-name', 'Values': ['stopped']}]
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+            paginator = self.ec2_client.get_paginator('describe_instances')
+            pages = paginator.paginate(
+                Filters=[{'Name': 'instance-state-name', 'Values': ['stopped']}],
+                PaginationConfig={'PageSize': DESCRIBE_PAGE_SIZE}
             )
             
-            old_stopped_instances = []
-            for reservation in response['Reservations']:
-                for instance in reservation['Instances']:
-                    launch_time = instance['LaunchTime'].replace(tzinfo=None)
-                    if launch_time < cutoff_date:
-                        old_stopped_instances.append({
-                            'InstanceId': instance['InstanceId'],
-                            'InstanceType': instance['InstanceType'],
-                            'LaunchTime': instance['LaunchTime'].isoformat(),
-                            'State': instance['State']['Name'],
-                            'Name': self._get_instance_name(instance)
-                        })
-            
-            return old_stopped_instances
-        except Exception as e:
-            logger.error(f"Error finding stopped instances: {e}")
-            return []
+            for page in pages:
+                for reservation in page['Reservations']:
+                    for instance in reservation['Instances']:
+                        match = _STOP_RE.search(instance.get('StateTransitionReason', ''))
+                        if not match:
+                            continue
+                        stopped_at = datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S')
+                        if stopped_at.replace(tzinfo=timezone.utc) < cutoff_date:
+                            yield {
+                                'InstanceId': instance['InstanceId'],
+                                'InstanceType': instance['InstanceType'],
+                                'LaunchTime': instance['LaunchTime'].isoformat(),
+                                'State': instance['State']['Name'],
+                                'Name': self._get_instance_name(instance)
+                            }
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code not in _SKIP_REGION_CODES:
+                raise
+            logger.warning(f"Skipping stopped instances in {self.region}: {code}")
+            self.skipped['instances'] = code
     
     def _get_instance_name(self, instance: Dict) -> str:
         """Extract instance name from tags."""
-        tags = instance.get('Tags', [])
-        for tag in tags:
-            if tag['Key'] == 'Name':
-                return tag['Value']
-        return 'No Name'
+        return next((tag['Value'] for tag in instance.get('Tags', ()) if tag['Key'] == 'Name'), 'No Name')
+    
+    def _record_error(self, errors: List[Dict[str, Any]], resource_type: str, code: str,
+                      message: str, resource_id: Optional[str] = None) -> None:
+        """Append a structured entry to results['errors'].
+        
+        Every entry has the same keys; `id` is None for failures that are not
+        tied to a single resource (a skipped or failed resource type).
+        """
+        errors.append({
+            'region': self.region,
+            'resource': resource_type,
+            'id': resource_id,
+            'code': code,
+            'message': message
+        })
+    
+    def _release_eip(self, eip: Dict[str, Any], errors: List[Dict[str, Any]]) -> bool:
+        """Release a single Elastic IP, recording any error."""
+        try:
+            if eip['Domain'] == 'vpc':
+                self.ec2_client.release_address(AllocationId=eip['AllocationId'])
+            else:
+                self.ec2_client.release_address(PublicIp=eip['PublicIp'])
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Released EIP: {eip['PublicIp']}")
+            return True
+        except (ClientError, BotoCoreError) as e:
+            logger.error(f"Error releasing EIP {eip['PublicIp']}: {e}")
+            self._record_error(errors, 'eips', _error_code(e), str(e), eip['PublicIp'])
+            return False
+    
+    def _delete_snapshot(self, snapshot: Dict[str, Any], errors: List[Dict[str, Any]]) -> bool:
+        """Delete a single snapshot, recording any error."""
+        try:
+            self.ec2_client.delete_snapshot(SnapshotId=snapshot['SnapshotId'])
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Deleted snapshot: {snapshot['SnapshotId']}")
+            return True
+        except (ClientError, BotoCoreError) as e:
+            logger.error(f"Error deleting snapshot {snapshot['SnapshotId']}: {e}")
+            self._record_error(errors, 'snapshots', _error_code(e), str(e), snapshot['SnapshotId'])
+            return False
+    
+    def _terminate_batch(self, instance_ids: List[str], errors: List[Dict[str, Any]]) -> int:
+        """Terminate one batch of instances, returning how many were terminated.
+        
+        One bad ID fails the whole call even though part of the batch may
+        have been terminated, so a failed batch is retried one at a time.
+        """
+        try:
+            response = self.ec2_client.terminate_instances(InstanceIds=instance_ids)
+        except (ClientError, BotoCoreError) as e:
+            if len(instance_ids) > 1:
+                logger.warning(f"Terminating {len(instance_ids)} instances failed, retrying one at a time: {e}")
+                return sum(self._terminate_batch([instance_id], errors) for instance_id in instance_ids)
+            logger.error(f"Error terminating instance {instance_ids[0]}: {e}")
+            self._record_error(errors, 'instances', _error_code(e), str(e), instance_ids[0])
+            return 0
+        
+        terminated = [item['InstanceId'] for item in response.get('TerminatingInstances', ())]
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Terminated instances: {', '.join(terminated)}")
+        return len(terminated)
+    
+    def _cleanup_eips(self, dry_run: bool, errors: List[Dict[str, Any]]) -> int:
+        """Find and release unused EIPs, returning how many were cleaned."""
+        unused_eips = self.find_unused_elastic_ips()
+        if dry_run:
+            found = released = sum(1 for _ in unused_eips)
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_DELETE_WORKERS) as executor:
+                outcomes = list(executor.map(lambda eip: self._release_eip(eip, errors), unused_eips))
+            found, released = len(outcomes), sum(outcomes)
+        logger.info(f"Found {found} unused EIPs")
+        return released
+    
+    def _cleanup_snapshots(self, days: int, dry_run: bool, errors: List[Dict[str, Any]]) -> int:
+        """Find and delete old snapshots, returning how many were cleaned."""
+        old_snapshots = self.find_old_snapshots(days)
+        if dry_run:
+            found = deleted = sum(1 for _ in old_snapshots)
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_DELETE_WORKERS) as executor:
+                outcomes = list(executor.map(lambda snapshot: self._delete_snapshot(snapshot, errors), old_snapshots))
+            found, deleted = len(outcomes), sum(outcomes)
+        logger.info(f"Found {found} old snapshots")
+        return deleted
+    
+    def _cleanup_instances(self, days: int, dry_run: bool, errors: List[Dict[str, Any]]) -> int:
+        """Find and terminate stopped instances, returning how many were cleaned."""
+        instance_ids = (instance['InstanceId'] for instance in self.find_stopped_instances(days))
+        found = terminated = 0
+        for batch in _batched(instance_ids, TERMINATE_BATCH_SIZE):
+            found += len(batch)
+            terminated += len(batch) if dry_run else self._terminate_batch(batch, errors)
+        logger.info(f"Found {found} stopped instances")
+        return terminated
     
     def cleanup_resources(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Perform cleanup based on configuration."""
+        """Perform cleanup based on configuration.
+        
+        The resource types are independent, so each runs in its own thread.
+        """
         results = {
             'region': self.region,
             'timestamp': datetime.now().isoformat(),
             'cleaned': {'eips': 0, 'snapshots': 0, 'instances': 0},
-            'errors': []
+            'errors': [],
+            'failed': []
         }
         
         dry_run = config.get('dry_run', True)
+        errors = results['errors']
         
-        # Clean Elastic IPs
-        if config.get('clean_eips', False):
-            try:
-                unused_eips = self.find_unused_elastic_ips()
-                logger.info(f"Found {len(unused_eips)} unused EIPs")
-                
-                for eip in unused_eips:
-                    if not dry_run:
-                        try:
-                            if eip['Domain'] == 'vpc':
-                                self.ec2_client.release_address(AllocationId=eip['AllocationId'])
-                            else:
-                                self.ec2_client.release_address(PublicIp=eip['PublicIp'])
-                            logger.info(f"Released EIP: {eip['PublicIp']}")
-                        except Exception as e:
-                            error_msg = f"Error releasing EIP {eip['PublicIp']}: {e}"
-                            logger.error(error_msg)
-                            results['errors'].append(error_msg)
-                            continue
-                    
-                    results['cleaned']['eips'] += 1
-            except Exception as e:
-                error_msg = f"Error in EIP cleanup: {e}"
-                logger.error(error_msg)
-                results['errors'].append(error_msg)
+        tasks = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(RESOURCE_TYPES)) as executor:
+            if config.get('clean_eips', False):
+                tasks['eips'] = executor.submit(self._cleanup_eips, dry_run, errors)
+            if config.get('clean_snapshots', False):
+                tasks['snapshots'] = executor.submit(
+                    self._cleanup_snapshots, config.get('snapshot_days', 30), dry_run, errors
+                )
+            if config.get('clean_instances', False):
+                tasks['instances'] = executor.submit(
+                    self._cleanup_instances, config.get('instance_days', 7), dry_run, errors
+                )
         
-        # Clean old snapshots
-        if config.get('clean_snapshots', False):
+        # A failed resource type is recorded rather than raised, so what the
+        # other types and regions already cleaned still reaches the response
+        for resource_type, future in tasks.items():
             try:
-                days = config.get('snapshot_days', 30)
-                old_snapshots = self.find_old_snapshots(days)
-                logger.info(f"Found {len(old_snapshots)} old snapshots")
-                
-                for snapshot in old_snapshots:
-                    if not dry_run:
-                        try:
-                            self.ec2_client.delete_snapshot(SnapshotId=snapshot['SnapshotId'])
-                            logger.info(f"Deleted snapshot: {snapshot['SnapshotId']}")
-                        except Exception as e:
-                            error_msg = f"Error deleting snapshot {snapshot['SnapshotId']}: {e}"
-                            logger.error(error_msg)
-                            results['errors'].append(error_msg)
-                            continue
-                    
-                    results['cleaned']['snapshots'] += 1
+                results['cleaned'][resource_type] += future.result()
             except Exception as e:
-                error_msg = f"Error in snapshot cleanup: {e}"
-                logger.error(error_msg)
-                results['errors'].append(error_msg)
+                logger.error(f"Error cleaning {resource_type} in {self.region}: {e}")
+                self._record_error(errors, resource_type, _error_code(e), str(e))
+                results['failed'].append(resource_type)
         
-        # Clean stopped instances
-        if config.get('clean_instances', False):
-            try:
-                days = config.get('instance_days', 7)
-                stopped_instances = self.find_stopped_instances(days)
-                logger.info(f"Found {len(stopped_instances)} stopped instances")
-                
-                for instance in stopped_instances:
-                    if not dry_run:
-                        try:
-                            self.ec2_client.terminate_instances(InstanceIds=[instance['InstanceId']])
-                            logger.info(f"Terminated instance: {instance['InstanceId']}")
-                        except Exception as e:
-                            error_msg = f"Error terminating instance {instance['InstanceId']}: {e}"
-                            logger.error(error_msg)
-                            results['errors'].append(error_msg)
-                            continue
-                    
-                    results['cleaned']['instances'] += 1
-            except Exception as e:
-                error_msg = f"Error in instance cleanup: {e}"
-                logger.error(error_msg)
-                results['errors'].append(error_msg)
+        for resource_type, code in self.skipped.items():
+            self._record_error(errors, resource_type, code, f"Skipped: no access to {resource_type} in this region")
         
         return results
 
@@ -210,18 +370,21 @@ def lambda_handler(event, context):
             'instance_days': event.get('instance_days', 7)
         }
         
-        regions = event.get('regions', [boto3.Session().region_name])
-        all_results = []
+        regions = event.get('regions', [_SESSION.region_name])
         
         logger.info(f"Starting cleanup in regions: {regions}")
         logger.info(f"Configuration: {config}")
         
-        # Process each region
+        # Process regions concurrently; clients are created up front since
+        # building them from a shared session is not thread-safe
+        cleaners = []
         for region in regions:
             logger.info(f"Processing region: {region}")
-            cleaner = LambdaResourceCleaner(region)
-            result = cleaner.cleanup_resources(config)
-            all_results.append(result)
+            cleaners.append(LambdaResourceCleaner(region))
+        
+        max_workers = max(1, min(MAX_REGION_WORKERS, len(cleaners)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            all_results = list(executor.map(lambda c: c.cleanup_resources(config), cleaners))
         
         # Aggregate results
         total_cleaned = {'eips': 0, 'snapshots': 0, 'instances': 0}
@@ -232,10 +395,11 @@ def lambda_handler(event, context):
                 total_cleaned[resource_type] += result['cleaned'][resource_type]
             all_errors.extend(result['errors'])
         
+        failed = any(result['failed'] for result in all_results)
         response = {
-            'statusCode': 200,
+            'statusCode': 500 if failed else 200,
             'body': {
-                'message': 'Cleanup completed successfully',
+                'message': 'Cleanup completed with errors' if failed else 'Cleanup completed successfully',
                 'total_cleaned': total_cleaned,
                 'regions_processed': len(regions),
                 'dry_run': config['dry_run'],
@@ -29,9 +29,9 @@ def test_cli_cleaner():
         cleaner = AWSResourceCleaner(dry_run=True)
         
         # Test finding resources (dry run)
-        eips = cleaner.find_unused_elastic_ips()
-        snapshots = cleaner.find_old_snapshots(30)
-        instances = cleaner.find_stopped_instances(7)
+        eips = list(cleaner.find_unused_elastic_ips())
+        snapshots = list(cleaner.find_old_snapshots(30))
+        instances = list(cleaner.find_stopped_instances(7))
         
         print(f"Found {len(eips)} unused EIPs")
         print(f"Found {len(snapshots)} old snapshots")